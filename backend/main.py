@@ -10,19 +10,35 @@ Start:
     uvicorn main:app --reload --port 8000
 """
 import asyncio
-import json
+import hashlib
+import logging
 import os
-import re
-import shlex
-import sqlite3
-import subprocess
+import threading
+import time
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Any, Optional
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import aiosqlite
+import httpx
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, StringConstraints
+
+try:
+    # ~2-4x faster event loop for the WS fan-out and async I/O paths;
+    # install() also covers `uvicorn --reload` dev runs.
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# Reuse uvicorn's error logger so messages land in the service logs.
+_log = logging.getLogger("uvicorn.error")
 
 # ── Config ─────────────────────────────────────────────────────────────────────
 BOT_DIR          = Path(os.getenv("BOT_DIR", "/Users/akagami/astro-bot"))
@@ -41,33 +57,92 @@ _USE_PG = bool(DATABASE_URL)
 if _USE_PG:
     import psycopg2
     import psycopg2.extras
-
+    import psycopg2.pool
+    from contextlib import contextmanager
+
+    # Each psycopg2.connect to Railway pays a TCP+TLS handshake; endpoints
+    # issue several queries per request, so hand out pooled connections.
+    _PG_POOL = psycopg2.pool.ThreadedConnectionPool(
+        2, 20, DATABASE_URL, sslmode="require")
+
+    # id()s of live pooled connections whose sessions hold our PREPAREd
+    # statements. psycopg2 connections are C objects that reject arbitrary
+    # attributes, so the flag has to live outside the connection; entries are
+    # discarded whenever a connection is closed so a recycled id() can't
+    # masquerade as an already-prepared session.
+    _PG_PREPARED: set[int] = set()
+
+    def _pg_close_conn(conn):
+        _PG_PREPARED.discard(id(conn))
+        _PG_POOL.putconn(conn, close=True)
+
+    @contextmanager
     def _pg_conn():
-        return psycopg2.connect(DATABASE_URL, sslmode="require")
+        conn = _PG_POOL.getconn()
+        if conn.closed:  # Railway drops idle conns; swap in a fresh one
+            _pg_close_conn(conn)
+            conn = _PG_POOL.getconn()
+        try:
+            yield conn
+        except psycopg2.OperationalError:
+            # Socket died mid-query — close it so the pool replaces it
+            # instead of handing the dead connection to the next caller.
+            _pg_close_conn(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                try:
+                    conn.rollback()  # reads leave a tx open; clear it before reuse
+                    _PG_POOL.putconn(conn)
+                except Exception:
+                    _pg_close_conn(conn)
+
+    _PG_SIGNALS_COLS = """id, user_id, timestamp, symbol, action,
+                          western_score, vedic_score,
+                          western_slope AS western_signal,
+                          vedic_slope   AS vedic_signal,
+                          nakshatra, entry_price, stop_loss, target,
+                          position_usdt AS position_size_usdt,
+                          paper, close_price, pnl, result, notes,
+                          full_signal"""
+
+    def _pg_prepare_signals(conn):
+        """PREPARE both signal SELECT shapes once per pooled connection, so
+        repeat queries skip the parse/plan step (and the WHERE f-string)."""
+        if id(conn) in _PG_PREPARED:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    PREPARE signals_all (text, int) AS
+                    SELECT {_PG_SIGNALS_COLS}
+                    FROM signals WHERE user_id = $1
+                    ORDER BY id DESC LIMIT $2
+                """)
+                cur.execute(f"""
+                    PREPARE signals_closed (text, int) AS
+                    SELECT {_PG_SIGNALS_COLS}
+                    FROM signals WHERE user_id = $1 AND pnl IS NOT NULL
+                    ORDER BY id DESC LIMIT $2
+                """)
+            conn.commit()  # _pg_conn rolls back on return; keep the PREPAREs
+        except psycopg2.errors.DuplicatePreparedStatement:
+            # Session was prepared under a previous (recycled) id().
+            conn.rollback()
+        _PG_PREPARED.add(id(conn))
 
     def _pg_query_signals(user_id: str, limit: int = 200,
                           closed_only: bool = False) -> list[dict]:
-        where  = "WHERE user_id = %s"
-        params = [user_id]
-        if closed_only:
-            where += " AND pnl IS NOT NULL"
         with _pg_conn() as conn:
+            _pg_prepare_signals(conn)
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(f"""
-                    SELECT id, user_id, timestamp, symbol, action,
-                           western_score, vedic_score,
-                           western_slope AS western_signal,
-                           vedic_slope   AS vedic_signal,
-                           nakshatra, entry_price, stop_loss, target,
-                           position_usdt AS position_size_usdt,
-                           paper, close_price, pnl, result, notes,
-                           full_signal
-                    FROM signals
-                    {where}
-                    ORDER BY id DESC
-                    LIMIT %s
-                """, (*params, limit))
-                return [dict(r) for r in cur.fetchall()]
+                cur.execute("EXECUTE signals_closed (%s, %s)" if closed_only
+                            else "EXECUTE signals_all (%s, %s)",
+                            (user_id, limit))
+                # RealDictRow is a dict subclass — orjson and the stats loop
+                # both consume it directly, so skip the per-row dict() copy.
+                return cur.fetchall()
 
     def _pg_load(user_id: str, data_type: str, default):
         key = f"{user_id}:{data_type}"
@@ -75,26 +150,192 @@ if _USE_PG:
             with conn.cursor() as cur:
                 cur.execute("SELECT value FROM kv_store WHERE key = %s", (key,))
                 row = cur.fetchone()
-                return json.loads(row[0]) if row else default
+                return orjson.loads(row[0]) if row else default
 
-    def _pg_save(user_id: str, data_type: str, value):
-        key = f"{user_id}:{data_type}"
+    def _pg_save_many(items: dict[str, Any]):
+        """Upsert several kv_store rows in one statement + one commit."""
+        if not items:
+            return
+        rows = [(k, orjson.dumps(v).decode()) for k, v in items.items()]
         with _pg_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO kv_store (key, value) VALUES (%s, %s)
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO kv_store (key, value) VALUES %s
                     ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
-                """, (key, json.dumps(value)))
+                """, rows)
+            conn.commit()
+
+    def _pg_save(user_id: str, data_type: str, value):
+        _pg_save_many({f"{user_id}:{data_type}": value})
+
+    # Matches the two hot query shapes: the top-N per-user scan and the
+    # closed-trades variant (partial index skips the pnl filter entirely).
+    # kv_store.key already carries a unique constraint (ON CONFLICT target).
+    _PG_INDEX_DDL = (
+        "CREATE INDEX IF NOT EXISTS signals_user_id_id_desc_idx "
+        "ON signals (user_id, id DESC)",
+        "CREATE INDEX IF NOT EXISTS signals_user_closed_idx "
+        "ON signals (user_id, id DESC) WHERE pnl IS NOT NULL",
+    )
+
+    # Tiny membership table so listing users is an index-only scan of ~N rows
+    # instead of a DISTINCT over the whole signals table. Backfilled from
+    # existing signals at startup; kept fresh by a trigger on insert.
+    _PG_USERS_DDL = (
+        """CREATE TABLE IF NOT EXISTS dashboard_users (
+               user_id    text PRIMARY KEY,
+               first_seen timestamptz DEFAULT now()
+           )""",
+        """INSERT INTO dashboard_users (user_id)
+           SELECT DISTINCT user_id FROM signals
+           ON CONFLICT DO NOTHING""",
+        """CREATE OR REPLACE FUNCTION dashboard_users_track() RETURNS trigger AS $$
+           BEGIN
+               INSERT INTO dashboard_users (user_id) VALUES (NEW.user_id)
+               ON CONFLICT DO NOTHING;
+               RETURN NEW;
+           END
+           $$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS signals_track_user ON signals",
+        """CREATE TRIGGER signals_track_user
+           AFTER INSERT ON signals
+           FOR EACH ROW EXECUTE FUNCTION dashboard_users_track()""",
+    )
+
+    def _pg_ensure_indexes():
+        with _pg_conn() as conn:
+            with conn.cursor() as cur:
+                for ddl in _PG_INDEX_DDL + _PG_USERS_DDL:
+                    cur.execute(ddl)
             conn.commit()
 
+    def _pg_user_dashboard(user_id: str) -> tuple[dict, dict, list]:
+        """
+        Everything /stats needs in one round-trip: the closed-trade aggregate
+        plus the equity_state and open_positions kv rows as scalar subselects
+        hanging off the CTE.
+        """
+        with _pg_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    WITH recent AS (
+                        SELECT pnl
+                        FROM signals
+                        WHERE user_id = %s AND pnl IS NOT NULL
+                        ORDER BY id DESC
+                        LIMIT %s
+                    ), agg AS (
+                        SELECT COUNT(*)                                      AS trades,
+                               COUNT(*) FILTER (WHERE pnl > 0)               AS wins,
+                               COUNT(*) FILTER (WHERE pnl <= 0)              AS losses,
+                               COALESCE(SUM(pnl), 0)                         AS total_pnl,
+                               COALESCE(AVG(pnl) FILTER (WHERE pnl > 0), 0)  AS avg_win,
+                               COALESCE(AVG(pnl) FILTER (WHERE pnl <= 0), 0) AS avg_loss
+                        FROM recent
+                    )
+                    SELECT agg.*,
+                           (SELECT value FROM kv_store WHERE key = %s),
+                           (SELECT value FROM kv_store WHERE key = %s)
+                    FROM agg
+                """, (user_id, _STATS_WINDOW, f"{user_id}:equity_state",
+                      f"{user_id}:open_positions"))
+                row = cur.fetchone()
+        trades, wins, losses = row[0], row[1], row[2]
+        total = float(row[3])
+        stats = {
+            "trades":   trades,
+            "wins":     wins,
+            "losses":   losses,
+            "win_rate": round(wins / trades * 100, 1) if trades else 0.0,
+            "total_pnl": round(total, 2),
+            "avg_win":  round(float(row[4]), 2),
+            "avg_loss": round(float(row[5]), 2),
+        }
+        equity = dict(orjson.loads(row[6]) if row[6] else {})
+        equity.update({
+            "paper_pnl":    round(total, 4),
+            "paper_trades": trades,
+            "paper_wins":   wins,
+            "paper_losses": losses,
+        })
+        positions = orjson.loads(row[7]) if row[7] else []
+        return stats, equity, positions
+
+    def _pg_latest_signal_all(user_ids: list[str]) -> dict[str, dict]:
+        """Latest signal for every user in one round-trip."""
+        if not user_ids:
+            return {}
+        with _pg_conn() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute("""
+                    SELECT DISTINCT ON (user_id)
+                           id, user_id, timestamp, symbol, action,
+                           western_score, vedic_score,
+                           western_slope AS western_signal,
+                           vedic_slope   AS vedic_signal,
+                           nakshatra, entry_price, stop_loss, target,
+                           position_usdt AS position_size_usdt,
+                           paper, close_price, pnl, result, notes,
+                           full_signal
+                    FROM signals
+                    WHERE user_id = ANY(%s)
+                    ORDER BY user_id, id DESC
+                """, (user_ids,))
+                return {r["user_id"]: r for r in cur.fetchall()}
+
+    def _pg_kv_multiget(keys: list[str]) -> dict:
+        """Fetch several kv_store rows in one round-trip."""
+        if not keys:
+            return {}
+        with _pg_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT key, value FROM kv_store WHERE key = ANY(%s)",
+                            (keys,))
+                return {k: orjson.loads(v) for k, v in cur.fetchall()}
+
+    # The bot fires NOTIFY on this channel after writing a signal; the WS
+    # broadcast loop uses it to push immediately instead of waiting a tick.
+    _PG_NOTIFY_CHANNEL = "signals_changed"
+
+    def _pg_listen_forever(on_notify):
+        """
+        Dedicated LISTEN connection (pooled conns get rolled back between
+        uses, which would drop the subscription). Runs in a daemon thread;
+        calls on_notify() for each notification and reconnects on failure.
+        """
+        import select
+        while True:
+            try:
+                conn = psycopg2.connect(DATABASE_URL, sslmode="require")
+                conn.set_isolation_level(
+                    psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {_PG_NOTIFY_CHANNEL}")
+                while True:
+                    if not select.select([conn], [], [], 60)[0]:
+                        continue  # timeout — just keep the connection warm
+                    conn.poll()
+                    if conn.notifies:
+                        conn.notifies.clear()
+                        on_notify()
+            except Exception:
+                time.sleep(5)  # transient DB hiccup — re-establish the LISTEN
+
     def _pg_list_users() -> list[str]:
         """Return all user_ids that have signals in the DB."""
         with _pg_conn() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT DISTINCT user_id FROM signals ORDER BY user_id")
+                try:
+                    cur.execute("SELECT user_id FROM dashboard_users ORDER BY user_id")
+                except psycopg2.Error:
+                    # Table missing (e.g. DDL ran under a read-only role) —
+                    # fall back to the full DISTINCT scan.
+                    conn.rollback()
+                    cur.execute("SELECT DISTINCT user_id FROM signals ORDER BY user_id")
                 return [r[0] for r in cur.fetchall()]
 
-app = FastAPI(title="Astro-Bot Dashboard API", version="1.0.0")
+app = FastAPI(title="Astro-Bot Dashboard API", version="1.0.0",
+              default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -102,81 +343,273 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Signals/trades responses are hundreds of rows of mostly-ASCII JSON — they
+# compress 5-10x. Level 5 keeps CPU cost low for the frequent small payloads.
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 _COLORS = ["#58a6ff", "#3fb950", "#f78166", "#d2a8ff", "#ffa657", "#79c0ff"]
 
 
+# Parsed users.json keyed by its mtime — load_users runs on every REST call,
+# but the file only changes on register/remove. In PG mode the merged list
+# also expires after a short TTL so users newly discovered in the signals
+# table still show up without a file touch. The id→user map is built in the
+# same refresh so resolve_user() is a single dict lookup.
+_USERS_TTL      = 30.0  # PG merge refresh
+_USERS_STAT_TTL = 5.0   # skip even the users.json stat within this window
+_users_cache: Optional[tuple[int, float, list[dict], dict[str, dict]]] = None
+_users_checked = 0.0
+
+
+# user_id → Path, so resolve_user skips re-parsing the bot_dir string on
+# every request. Cleared whenever the users list changes.
+_RESOLVED: dict[str, Path] = {}
+
+
+def _invalidate_users_cache():
+    global _users_cache
+    _users_cache = None
+    _RESOLVED.clear()
+
+
 def load_users() -> list[dict]:
     """
     Returns the user list.
     In PG mode: merges users.json with any user_ids found in the signals table
     so that newly provisioned Railway services appear automatically.
     """
+    global _users_cache, _users_checked
+    now = time.monotonic()
+    if _users_cache is not None and now - _users_checked < _USERS_STAT_TTL:
+        return _users_cache[2]
+    mtime = USERS_FILE.stat().st_mtime_ns if USERS_FILE.exists() else 0
+    if (_users_cache is not None and _users_cache[0] == mtime
+            and (not _USE_PG or now - _users_cache[1] < _USERS_TTL)):
+        _users_checked = now
+        return _users_cache[2]
+
     base: list[dict] = []
     if USERS_FILE.exists():
-        base = json.loads(USERS_FILE.read_text())
+        base = orjson.loads(USERS_FILE.read_bytes())
     if not base:
         base = [{"id": "default", "name": "Main Bot",
                  "bot_dir": str(BOT_DIR), "color": "#58a6ff"}]
 
     if _USE_PG:
         try:
-            known_ids  = {u["id"] for u in base}
-            db_ids     = _pg_list_users()
-            for i, uid in enumerate(db_ids):
+            known_ids = {u["id"] for u in base}
+            # Colour index advances only when a user is actually appended
+            # (and continues from the users.json entries), so indexing by the
+            # db_ids position doesn't skew assignments or duplicate colours.
+            j = len(base)
+            for uid in _pg_list_users():
                 if uid not in known_ids:
                     base.append({
                         "id":      uid,
                         "name":    uid.replace("-", " ").title(),
                         "bot_dir": str(BOT_DIR),
-                        "color":   _COLORS[i % len(_COLORS)],
+                        "color":   _COLORS[j % len(_COLORS)],
                     })
+                    j += 1
         except Exception:
             pass
 
+    _users_cache   = (mtime, now, base, {u["id"]: u for u in base})
+    _users_checked = now
+    _RESOLVED.clear()
     return base
 
 
 def users_map() -> dict[str, dict]:
-    return {u["id"]: u for u in load_users()}
+    """id→user dict, built alongside the cached list in load_users()."""
+    load_users()
+    return _users_cache[3]
+
+
+def _save_users(users: list[dict]) -> None:
+    """Persist users.json atomically and prime the cache with the in-memory
+    list, so the next request doesn't re-stat and re-parse what we just
+    wrote. Stays indented — users.json gets hand-edited in local dev."""
+    global _users_cache, _users_checked
+    atomic_write_json(USERS_FILE, users)
+    now = time.monotonic()
+    _users_cache   = (USERS_FILE.stat().st_mtime_ns, now, users,
+                      {u["id"]: u for u in users})
+    _users_checked = now
+    _RESOLVED.clear()
 
 
 def resolve_user(user_id: str) -> Path:
+    path = _RESOLVED.get(user_id)
+    if path is not None:
+        return path
     um = users_map()
     if user_id not in um:
         raise HTTPException(404, f"User '{user_id}' not found")
-    return Path(um[user_id]["bot_dir"])
+    path = Path(um[user_id]["bot_dir"])
+    _RESOLVED[user_id] = path
+    return path
+
+
+# ── Short-TTL result cache ─────────────────────────────────────────────────────
+# The bot only writes new signals every few minutes, but every browser tab
+# polls the same endpoints constantly; a 15s in-process cache collapses those
+# to one query per interval.
+_CACHE_TTL = 15.0
+# Bounded: keys include client-controlled query params (limit etc.), so an
+# unauthenticated caller must not be able to grow the dict without end.
+_CACHE_MAX = 256
+_result_cache: dict[tuple, tuple[float, object]] = {}
+
+
+def _cache_get(key: tuple):
+    hit = _result_cache.get(key)
+    if hit is not None and time.monotonic() < hit[0]:
+        return hit
+    return None
+
+
+def _cache_put(key: tuple, value, ttl: float = _CACHE_TTL):
+    if len(_result_cache) >= _CACHE_MAX:
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in _result_cache.items() if exp < now]
+        for k in expired:
+            del _result_cache[k]
+        if len(_result_cache) >= _CACHE_MAX:
+            _result_cache.clear()  # crude, but hot entries repopulate in one TTL
+    _result_cache[key] = (time.monotonic() + ttl, value)
+
+
+def atomic_write_json(path: Path, data, *, indent: bool = True) -> None:
+    """
+    Write JSON via a temp file + os.replace so concurrent readers (the bot,
+    the WS sweep) never see a torn half-written file. Pass indent=False for
+    machine-only files written on the hot path; keep the default for files
+    people edit by hand (users.json).
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0))
+    os.replace(tmp, path)
+
+
+# Parsed JSON files keyed by (path → mtime_ns): the parse is skipped entirely
+# while the bot hasn't rewritten the file, and a rewrite is picked up instantly.
+_file_cache: dict[str, tuple[int, object]] = {}
 
 
 def read_json_safe(path: Path, default=None):
     try:
-        if path.exists():
-            return json.loads(path.read_text())
+        # Single stat doubles as the existence check (OSError when missing).
+        mtime = path.stat().st_mtime_ns
+        hit = _file_cache.get(str(path))
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        data = orjson.loads(path.read_bytes())
+        _file_cache[str(path)] = (mtime, data)
+        return data
     except Exception:
-        pass
-    return default if default is not None else {}
+        return default if default is not None else {}
+
+
+# ── SQLite connection cache (local dev) ────────────────────────────────────────
+# One long-lived aiosqlite connection per signals.db; opening SQLite per request
+# costs more than the ~20-row query it serves, and blocks the event loop.
+_sqlite_conns: dict[str, aiosqlite.Connection] = {}
+# Per-path lock so concurrent first requests don't each open (and leak) a
+# connection — aiosqlite backs every connection with its own thread.
+_sqlite_conn_locks: dict[str, asyncio.Lock] = {}
+
+# Constant query text so SQLite's prepared-statement cache is hit every call
+# instead of re-preparing a freshly formatted string.
+_SQL_SIGNALS_ALL    = "SELECT * FROM signals ORDER BY id DESC LIMIT ?"
+_SQL_SIGNALS_CLOSED = "SELECT * FROM signals WHERE pnl IS NOT NULL ORDER BY id DESC LIMIT ?"
+
+
+async def _sqlite_conn(db_path: Path) -> aiosqlite.Connection:
+    key = str(db_path)
+    conn = _sqlite_conns.get(key)
+    if conn is not None:
+        return conn
+    async with _sqlite_conn_locks.setdefault(key, asyncio.Lock()):
+        conn = _sqlite_conns.get(key)  # raced with another first request
+        if conn is not None:
+            return conn
+        conn = await aiosqlite.connect(key)
+        # WAL lets dashboard reads run concurrently with the bot writing new
+        # signals; mmap + in-memory temp avoid per-page copies on the hot
+        # ORDER BY id DESC scans.
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA mmap_size=268435456")
+        await conn.execute("PRAGMA cache_size=-64000")
+        try:
+            # Partial index for the closed-trades path (WHERE pnl IS NOT NULL
+            # ORDER BY id DESC) — mirrors the PG partial index. The earlier
+            # (pnl, id DESC) composite never satisfied that plan and only
+            # taxed the bot's inserts, so drop it where it exists.
+            await conn.execute("DROP INDEX IF EXISTS idx_signals_pnl_id")
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_signals_closed_id "
+                "ON signals(id DESC) WHERE pnl IS NOT NULL"
+            )
+            await conn.commit()
+        except Exception:
+            pass  # read-only mount or table not created yet — index is a nice-to-have
+        conn.row_factory = aiosqlite.Row
+        _sqlite_conns[key] = conn
+    return conn
+
+
+@app.on_event("shutdown")
+async def _close_sqlite_conns():
+    for conn in _sqlite_conns.values():
+        await conn.close()
+    _sqlite_conns.clear()
+
+
+@app.on_event("shutdown")
+async def _close_pg_pool():
+    if _USE_PG:
+        _PG_POOL.closeall()
+
+
+@app.on_event("startup")
+async def _ensure_pg_indexes():
+    if _USE_PG:
+        try:
+            await asyncio.to_thread(_pg_ensure_indexes)
+        except Exception:
+            pass  # e.g. read-only DB role — queries still work, just slower
+
 
+async def query_signals_db(bot_dir: Path, limit: int = 200, closed_only: bool = False,
+                           user_id: str = "default") -> list[dict]:
+    cache_key = ("signals", str(bot_dir), user_id, limit, closed_only)
+    hit = _cache_get(cache_key)
+    if hit:
+        return hit[1]
 
-def query_signals_db(bot_dir: Path, limit: int = 200, closed_only: bool = False,
-                     user_id: str = "default") -> list[dict]:
     # ── Postgres path ──────────────────────────────────────────────────────────
     if _USE_PG:
-        return _pg_query_signals(user_id, limit, closed_only)
+        rows = await asyncio.to_thread(_pg_query_signals, user_id, limit, closed_only)
+        _cache_put(cache_key, rows)
+        return rows
 
     # ── SQLite file path (local dev) ───────────────────────────────────────────
     db_path = bot_dir / "logs" / "signals.db"
-    if not db_path.exists():
+    # Only stat the filesystem before the first connect; afterwards the cached
+    # connection is authoritative.
+    if str(db_path) not in _sqlite_conns and not db_path.exists():
         return []
     try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        where = "WHERE pnl IS NOT NULL" if closed_only else ""
-        cur.execute(f"SELECT * FROM signals {where} ORDER BY id DESC LIMIT ?", (limit,))
+        conn = await _sqlite_conn(db_path)
+        sql = _SQL_SIGNALS_CLOSED if closed_only else _SQL_SIGNALS_ALL
+        cur = await conn.execute(sql, (limit,))
         rows = []
-        for r in cur.fetchall():
+        for r in await cur.fetchall():
             d = dict(r)
             # Normalize column names and include full_signal if present
             d["western_signal"] = d.get("western_slope") or d.get("western_signal")
@@ -185,7 +618,8 @@ def query_signals_db(bot_dir: Path, limit: int = 200, closed_only: bool = False,
             if "full_signal" not in d:
                 d["full_signal"] = None
             rows.append(d)
-        conn.close()
+        await cur.close()
+        _cache_put(cache_key, rows)
         return rows
     except Exception:
         return []
@@ -209,58 +643,195 @@ def _save_positions(bot_dir: Path, positions: list, user_id: str = "default"):
         return
     path = bot_dir / "logs" / "open_positions.json"
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(positions, indent=2))
+    atomic_write_json(path, positions, indent=False)
 
 
 # ── Stats helper ───────────────────────────────────────────────────────────────
+# Below this size the numpy array setup costs more than the Python loop saves.
+_STATS_VECTORIZE_MIN = 100
+
+# /stats has always described the most recent 500 closed trades (the original
+# endpoint fetched LIMIT 500 and aggregated in Python); every aggregate path
+# keeps that window.
+_STATS_WINDOW = 500
+
+
 def compute_stats(trades: list[dict]) -> dict:
     if not trades:
         return {"trades": 0, "wins": 0, "losses": 0, "win_rate": 0.0,
                 "total_pnl": 0.0, "avg_win": 0.0, "avg_loss": 0.0}
-    wins   = [t for t in trades if (t.get("pnl") or 0) > 0]
-    losses = [t for t in trades if (t.get("pnl") or 0) <= 0]
-    total  = sum(t.get("pnl") or 0 for t in trades)
+    if len(trades) > _STATS_VECTORIZE_MIN:
+        pnls = np.fromiter((t.get("pnl") or 0.0 for t in trades),
+                           dtype=np.float64, count=len(trades))
+        wins_mask = pnls > 0
+        wins      = int(wins_mask.sum())
+        losses    = len(trades) - wins
+        total     = float(pnls.sum())
+        avg_win   = float(pnls[wins_mask].mean())  if wins   else 0.0
+        avg_loss  = float(pnls[~wins_mask].mean()) if losses else 0.0
+    else:
+        # Single pass: each pnl is read once and binned as it goes by.
+        wins = losses = 0
+        won_total = lost_total = 0.0
+        for t in trades:
+            pnl = t.get("pnl") or 0
+            if pnl > 0:
+                wins += 1
+                won_total += pnl
+            else:
+                losses += 1
+                lost_total += pnl
+        total    = won_total + lost_total
+        avg_win  = won_total / wins    if wins   else 0.0
+        avg_loss = lost_total / losses if losses else 0.0
     return {
         "trades":   len(trades),
-        "wins":     len(wins),
-        "losses":   len(losses),
-        "win_rate": round(len(wins) / len(trades) * 100, 1) if trades else 0.0,
+        "wins":     wins,
+        "losses":   losses,
+        "win_rate": round(wins / len(trades) * 100, 1),
         "total_pnl": round(total, 2),
-        "avg_win":  round(sum(t["pnl"] for t in wins)   / len(wins),   2) if wins   else 0.0,
-        "avg_loss": round(sum(t["pnl"] for t in losses) / len(losses), 2) if losses else 0.0,
+        "avg_win":  round(avg_win, 2),
+        "avg_loss": round(avg_loss, 2),
+    }
+
+
+async def stats_from_db(bot_dir: Path) -> Optional[dict]:
+    """
+    Aggregate closed-trade stats inside SQLite (local dev path) instead of
+    shipping 500 rows to Python; returns None when the DB is unavailable.
+    """
+    db_path = bot_dir / "logs" / "signals.db"
+    if str(db_path) not in _sqlite_conns and not db_path.exists():
+        return None
+    try:
+        conn = await _sqlite_conn(db_path)
+        cur = await conn.execute("""
+            SELECT COUNT(*),
+                   SUM(CASE WHEN pnl >  0 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN pnl <= 0 THEN 1 ELSE 0 END),
+                   COALESCE(SUM(pnl), 0),
+                   COALESCE(AVG(CASE WHEN pnl >  0 THEN pnl END), 0),
+                   COALESCE(AVG(CASE WHEN pnl <= 0 THEN pnl END), 0)
+            FROM (SELECT pnl FROM signals WHERE pnl IS NOT NULL
+                  ORDER BY id DESC LIMIT ?)
+        """, (_STATS_WINDOW,))
+        row = await cur.fetchone()
+        await cur.close()
+    except Exception:
+        return None
+    trades, wins, losses = row[0] or 0, row[1] or 0, row[2] or 0
+    return {
+        "trades":   trades,
+        "wins":     wins,
+        "losses":   losses,
+        "win_rate": round(wins / trades * 100, 1) if trades else 0.0,
+        "total_pnl": round(row[3], 2),
+        "avg_win":  round(row[4], 2),
+        "avg_loss": round(row[5], 2),
     }
 
 
-def _computed_paper_totals(bot_dir: Path, user_id: str) -> dict:
+async def _computed_paper_totals(bot_dir: Path, user_id: str) -> dict:
     """
     Compute paper metrics directly from closed trade rows.
     This prevents stale equity_state snapshots from showing zero PnL.
     """
-    trades = query_signals_db(bot_dir, limit=5000, closed_only=True, user_id=user_id)
-    pnl_values = [(t.get("pnl") or 0.0) for t in trades if t.get("pnl") is not None]
-    total = float(sum(pnl_values))
-    wins = sum(1 for p in pnl_values if p > 0)
-    losses = sum(1 for p in pnl_values if p <= 0)
+    # Same window as the /stats aggregates so /equity and /stats report
+    # identical paper totals.
+    trades = await query_signals_db(bot_dir, limit=_STATS_WINDOW,
+                                    closed_only=True, user_id=user_id)
+    total = 0.0
+    wins = losses = 0
+    for t in trades:
+        pnl = t.get("pnl")
+        if pnl is None:
+            continue
+        total += pnl
+        if pnl > 0:
+            wins += 1
+        else:
+            losses += 1
     return {
         "paper_pnl": round(total, 4),
-        "paper_trades": len(pnl_values),
+        "paper_trades": wins + losses,
         "paper_wins": wins,
         "paper_losses": losses,
     }
 
 
-def _equity_with_computed_pnl(bot_dir: Path, user_id: str) -> dict:
-    equity = _load_equity(bot_dir, user_id=user_id) or {}
-    agg = _computed_paper_totals(bot_dir, user_id)
+async def _equity_with_computed_pnl(bot_dir: Path, user_id: str) -> dict:
+    # _load_equity blocks (Postgres round-trip / file read), so keep it off
+    # the event loop like the other sync loaders on async paths.
+    equity = await asyncio.to_thread(_load_equity, bot_dir, user_id) or {}
+    agg = await _computed_paper_totals(bot_dir, user_id)
     merged = dict(equity)
     merged.update(agg)
     return merged
 
 
+# ── Response models ────────────────────────────────────────────────────────────
+# Declaring these lets pydantic v2's Rust-core serializer handle the 500-row
+# signals/trades payloads instead of FastAPI's recursive jsonable_encoder.
+class SignalRow(BaseModel):
+    model_config = {"extra": "allow"}  # pass through any extra SQLite columns
+
+    id:                 Optional[int] = None
+    user_id:            Optional[str] = None
+    timestamp:          Optional[Any] = None
+    symbol:             Optional[str] = None
+    action:             Optional[str] = None
+    western_score:      Optional[float] = None
+    vedic_score:        Optional[float] = None
+    western_signal:     Optional[Any] = None
+    vedic_signal:       Optional[Any] = None
+    nakshatra:          Optional[str] = None
+    entry_price:        Optional[float] = None
+    stop_loss:          Optional[float] = None
+    target:             Optional[float] = None
+    position_size_usdt: Optional[float] = None
+    paper:              Optional[Any] = None
+    close_price:        Optional[float] = None
+    pnl:                Optional[float] = None
+    result:             Optional[str] = None
+    notes:              Optional[str] = None
+    full_signal:        Optional[Any] = None
+
+
+class StatsOut(BaseModel):
+    trades:         int = 0
+    wins:           int = 0
+    losses:         int = 0
+    win_rate:       float = 0.0
+    total_pnl:      float = 0.0
+    avg_win:        float = 0.0
+    avg_loss:       float = 0.0
+    peak_equity:    float = 0.0
+    paper_pnl:      float = 0.0
+    open_positions: int = 0
+
+
+# Conditional-GET support: the dashboard polls the same endpoints every few
+# seconds, but the payload only changes when the bot trades. Hash the encoded
+# body so unchanged polls cost a 304 instead of re-shipping hundreds of rows.
+def _etag_json(request: Request, payload) -> Response:
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.md5(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json",
+                    headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
 # ── Health ─────────────────────────────────────────────────────────────────────
+# Load balancers poll this every few seconds and the body never changes, so
+# serve constant pre-serialized bytes instead of re-encoding a dict per hit.
+_HEALTH_BYTES = orjson.dumps(
+    {"status": "ok", "storage": "postgres" if _USE_PG else "file"})
+
+
 @app.get("/health")
 def health():
-    return {"status": "ok", "storage": "postgres" if _USE_PG else "file"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # ── REST endpoints ─────────────────────────────────────────────────────────────
@@ -269,10 +840,10 @@ def list_users_endpoint():
     return load_users()
 
 
-@app.get("/api/users/{user_id}/signals")
-def get_signals(user_id: str, limit: int = 100):
+@app.get("/api/users/{user_id}/signals", response_model=list[SignalRow])
+async def get_signals(request: Request, user_id: str, limit: int = 100):
     bot_dir = resolve_user(user_id)
-    return query_signals_db(bot_dir, limit, user_id=user_id)
+    return _etag_json(request, await query_signals_db(bot_dir, limit, user_id=user_id))
 
 
 @app.get("/api/users/{user_id}/positions")
@@ -282,34 +853,41 @@ def get_positions(user_id: str):
 
 
 @app.get("/api/users/{user_id}/equity")
-def get_equity(user_id: str):
+async def get_equity(user_id: str):
     bot_dir = resolve_user(user_id)
-    return _equity_with_computed_pnl(bot_dir, user_id=user_id)
+    return await _equity_with_computed_pnl(bot_dir, user_id=user_id)
 
 
-@app.get("/api/users/{user_id}/trades")
-def get_trades(user_id: str, limit: int = 200):
+@app.get("/api/users/{user_id}/trades", response_model=list[SignalRow])
+async def get_trades(request: Request, user_id: str, limit: int = 200):
     bot_dir = resolve_user(user_id)
-    return query_signals_db(bot_dir, limit, closed_only=True, user_id=user_id)
+    rows = await query_signals_db(bot_dir, limit, closed_only=True, user_id=user_id)
+    return _etag_json(request, rows)
 
 
-@app.get("/api/users/{user_id}/stats")
-def get_stats(user_id: str):
+@app.get("/api/users/{user_id}/stats", response_model=StatsOut)
+async def get_stats(request: Request, user_id: str):
     bot_dir   = resolve_user(user_id)
-    trades    = query_signals_db(bot_dir, 500, closed_only=True, user_id=user_id)
-    equity    = _equity_with_computed_pnl(bot_dir, user_id=user_id)
-    positions = _load_positions(bot_dir, user_id=user_id)
-    stats     = compute_stats(trades)
+    if _USE_PG:
+        stats, equity, positions = await asyncio.to_thread(_pg_user_dashboard, user_id)
+    else:
+        stats = await stats_from_db(bot_dir)
+        if stats is None:
+            trades = await query_signals_db(bot_dir, _STATS_WINDOW, closed_only=True,
+                                            user_id=user_id)
+            stats  = compute_stats(trades)
+        equity    = await _equity_with_computed_pnl(bot_dir, user_id=user_id)
+        positions = _load_positions(bot_dir, user_id=user_id)
     stats["peak_equity"]    = equity.get("peak_equity", 0)
     stats["paper_pnl"]      = equity.get("paper_pnl", 0)
     stats["open_positions"] = len(positions)
-    return stats
+    return _etag_json(request, stats)
 
 
 @app.get("/api/users/{user_id}/latest-signal")
-def get_latest_signal(user_id: str):
+async def get_latest_signal(user_id: str):
     bot_dir = resolve_user(user_id)
-    rows = query_signals_db(bot_dir, 1, user_id=user_id)
+    rows = await query_signals_db(bot_dir, 1, user_id=user_id)
     return rows[0] if rows else {}
 
 
@@ -323,33 +901,97 @@ def _urlopen_no_ssl_verify(req, timeout=15):
     return urlreq.urlopen(req, timeout=timeout, context=ctx)
 
 
+# Shared async HTTP client for market-data calls: keep-alive reuses one TLS
+# session across requests instead of a fresh handshake per call.
+# verify=False mirrors _urlopen_no_ssl_verify (macOS cert issues in dev).
+_HTTP = httpx.AsyncClient(timeout=15.0, verify=False,
+                          limits=httpx.Limits(max_keepalive_connections=20))
+_HL_INFO_URL = "https://api.hyperliquid.xyz/info"
+
+# Railway traffic carries the API key and freshly registered users' private
+# keys — unlike the public market-data calls it must ride verified TLS, so it
+# gets its own client instead of the verify=False one above.
+_RAILWAY_HTTP = httpx.AsyncClient(
+    timeout=15.0, limits=httpx.Limits(max_keepalive_connections=5))
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    await _HTTP.aclose()
+    await _RAILWAY_HTTP.aclose()
+
+
+class _AsyncTTLCache:
+    """Small TTL cache whose concurrent misses coalesce into one in-flight
+    fetch: N tabs polling the same upstream cost one RTT, not N."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._values: dict = {}   # key -> (expiry, value)
+        self._locks: dict = {}    # key -> asyncio.Lock
+
+    async def get_or_fetch(self, key, ttl: float, fetch):
+        hit = self._values.get(key)
+        if hit is not None and time.monotonic() < hit[0]:
+            return hit[1]
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            hit = self._values.get(key)  # re-check: another task may have fetched
+            if hit is not None and time.monotonic() < hit[0]:
+                return hit[1]
+            value = await fetch()
+            if len(self._values) >= self.maxsize:
+                self._values.clear()
+                self._locks = {key: lock}
+            self._values[key] = (time.monotonic() + ttl, value)
+            return value
+
+
+_ticker_cache = _AsyncTTLCache(maxsize=8)
+_TICKER_TTL = 1.0  # allMids changes ~once per second
+
+
 # Hyperliquid returns max 500 candles per request; we paginate by time window
 HL_CANDLES_CHUNK = 500
 
+# Timeframe lookup tables, built once instead of per request.
+_HL_INTERVAL = {
+    "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
+    "1h": "1h", "4h": "4h", "1d": "1d",
+}
+_INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000,
+}
+_BINANCE_INTERVAL = {"1h": "1h", "4h": "4h", "1d": "1d"}
 
-def _fetch_ohlcv_hyperliquid(coin: str, hl_interval: str, start_ms: int, end_ms: int, _num):
-    import urllib.request as urlreq
-    interval_ms = {
-        "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
-        "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000,
-    }.get(hl_interval, 14_400_000)
+# Hoisted per-request constants for the candle fetchers: header dicts and the
+# string→float coercion used on every candle field.
+_HL_HEADERS = {"Content-Type": "application/json",
+               "User-Agent": "AstroBot-Dashboard/1.0"}
+_BINANCE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AstroBot/1.0)"}
+
+
+def _num(x) -> float:
+    return float(x)  # Hyperliquid sends prices as strings; float() handles both
+
+
+async def _fetch_ohlcv_hyperliquid(coin: str, hl_interval: str, start_ms: int, end_ms: int):
+    interval_ms = _INTERVAL_MS.get(hl_interval, 14_400_000)
     chunk_ms = HL_CANDLES_CHUNK * interval_ms
-    all_out = []
+    # Collect chunks newest-first and splice once at the end: prepending with
+    # `out + all_out` per chunk re-copies everything fetched so far, which
+    # goes quadratic on 50k-bar backfills.
+    chunks: list[list] = []
     current_end = end_ms
     while current_end > start_ms:
         current_start = max(start_ms, current_end - chunk_ms)
-        payload = json.dumps({
+        payload = orjson.dumps({
             "type": "candleSnapshot",
             "req": {"coin": coin, "interval": hl_interval, "startTime": current_start, "endTime": current_end},
-        }).encode()
-        req = urlreq.Request(
-            "https://api.hyperliquid.xyz/info",
-            data=payload,
-            headers={"Content-Type": "application/json", "User-Agent": "AstroBot-Dashboard/1.0"},
-            method="POST",
-        )
-        with _urlopen_no_ssl_verify(req, 15) as resp:
-            raw = json.loads(resp.read().decode())
+        })
+        resp = await _HTTP.post(_HL_INFO_URL, content=payload, headers=_HL_HEADERS)
+        raw = orjson.loads(resp.content)
         if not isinstance(raw, list):
             raise ValueError(f"Unexpected shape: {type(raw).__name__}")
         out = []
@@ -367,32 +1009,31 @@ def _fetch_ohlcv_hyperliquid(coin: str, hl_interval: str, start_ms: int, end_ms:
             })
         if not out:
             break
-        all_out = out + all_out
+        chunks.append(out)
         current_end = out[0]["time"] * 1000 - 1
+    all_out: list = []
+    for out in reversed(chunks):
+        all_out.extend(out)
     return all_out
 
 
-def _fetch_ohlcv_binance(coin: str, interval: str, limit: int, start_ms: int = 0):
-    import urllib.request as urlreq
+async def _fetch_ohlcv_binance(coin: str, interval: str, limit: int, start_ms: int = 0):
     sym = coin + "USDT"
     chunk = 1000  # Binance max per request
     all_rows = []
-    end_ms = int(__import__("time").time() * 1000)
+    back_chunks: list[list] = []  # newest-first; spliced once after the loop
+    back_count = 0
+    end_ms = int(time.time() * 1000)
     fetch_start = start_ms if start_ms > 0 else None
-    while len(all_rows) < limit:
+    while len(all_rows) + back_count < limit:
         url = (
             "https://api.binance.com/api/v3/klines"
             f"?symbol={sym}&interval={interval}&limit={chunk}&endTime={end_ms}"
         )
         if fetch_start is not None:
             url += f"&startTime={fetch_start}"
-        req = urlreq.Request(
-            url,
-            method="GET",
-            headers={"User-Agent": "Mozilla/5.0 (compatible; AstroBot/1.0)"},
-        )
-        with _urlopen_no_ssl_verify(req, 15) as resp:
-            raw = json.loads(resp.read().decode())
+        resp = await _HTTP.get(url, headers=_BINANCE_HEADERS)
+        raw = orjson.loads(resp.content)
         if not isinstance(raw, list) or not raw:
             break
         if fetch_start is not None:
@@ -408,13 +1049,17 @@ def _fetch_ohlcv_binance(coin: str, interval: str, limit: int, start_ms: int = 0
                 break
         else:
             # Backward from now
-            all_rows = raw + all_rows
+            back_chunks.append(raw)
+            back_count += len(raw)
             if len(raw) < chunk:
                 break
             end_ms = raw[0][0] - 1
-            if len(all_rows) >= limit:
-                all_rows = all_rows[-limit:]
+            if back_count >= limit:
                 break
+    if back_chunks:
+        for rows in reversed(back_chunks):
+            all_rows.extend(rows)
+        all_rows = all_rows[-limit:]
     return [
         {
             "time": int(row[0] / 1000),
@@ -429,9 +1074,29 @@ def _fetch_ohlcv_binance(coin: str, interval: str, limit: int, start_ms: int = 0
 # Fixed range start: 2025-01-01 00:00:00 UTC
 OHLCV_START_TIMESTAMP = 1735689600
 
+# Candles only change when a new bar opens, so cache per timeframe bucket:
+# the second request within the same 4h candle is a dict hit, not an RTT.
+# Values are the encoded JSON body, so a hit skips serialization too and
+# the response is a straight copy of cached bytes. Bounded because the key
+# includes client-controlled params (limit, start_time) on an open API.
+_OHLCV_CACHE_MAX = 64
+_ohlcv_cache: dict[tuple, tuple[int, bytes]] = {}
+_ohlcv_locks: dict[tuple, asyncio.Lock] = {}
+_OHLCV_HEADERS = {"Cache-Control": "public, max-age=60"}
+_OHLCV_LIMIT_MAX = 50000  # also the max_bars cap applied to start_time ranges
+
+
+def _ohlcv_cache_put(cache_key: tuple, bucket: int, body: bytes) -> None:
+    if len(_ohlcv_cache) >= _OHLCV_CACHE_MAX:
+        # Same crude clear-on-full as _AsyncTTLCache — the handful of series
+        # the dashboard actually charts repopulate within one candle.
+        _ohlcv_cache.clear()
+        _ohlcv_locks.clear()
+    _ohlcv_cache[cache_key] = (bucket, body)
+
 
 @app.get("/api/ohlcv")
-def get_ohlcv(
+async def get_ohlcv(
     symbol: str = "BTC/USDT",
     timeframe: str = "4h",
     limit: int = 2000,
@@ -441,88 +1106,115 @@ def get_ohlcv(
     Fetches OHLCV candles from start_time to now (or last `limit` bars if no start_time).
     Tries Hyperliquid first; on failure falls back to Binance.
     """
-    import time
-
     coin = symbol.split("/")[0]
-    hl_interval = {
-        "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-        "1h": "1h", "4h": "4h", "1d": "1d",
-    }.get(timeframe, "4h")
-    interval_ms = {
-        "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
-        "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000,
-    }.get(timeframe, 14_400_000)
+    limit = max(1, min(limit, _OHLCV_LIMIT_MAX))
+    hl_interval = _HL_INTERVAL.get(timeframe, "4h")
+    interval_ms = _INTERVAL_MS.get(timeframe, 14_400_000)
     end_ms = int(time.time() * 1000)
     if start_time is not None:
         start_ms = int(start_time) * 1000
         # Cap number of bars to avoid timeouts (e.g. 50k bars max)
-        max_bars = 50000
-        start_ms = max(start_ms, end_ms - max_bars * interval_ms)
+        start_ms = max(start_ms, end_ms - _OHLCV_LIMIT_MAX * interval_ms)
     else:
         start_ms = end_ms - limit * interval_ms
 
-    def _num(x):
-        return float(x) if isinstance(x, str) else float(x)
+    bucket = end_ms // interval_ms
+    cache_key = (coin, hl_interval, limit, start_time or 0)
+    hit = _ohlcv_cache.get(cache_key)
+    if hit is not None and hit[0] == bucket:
+        return Response(content=hit[1], media_type="application/json",
+                        headers=_OHLCV_HEADERS)
+
+    lock = _ohlcv_locks.setdefault(cache_key, asyncio.Lock())
+    async with lock:
+        # Re-check: concurrent misses for the same candle series coalesce
+        # behind the lock and all but the first return from cache.
+        hit = _ohlcv_cache.get(cache_key)
+        if hit is not None and hit[0] == bucket:
+            return Response(content=hit[1], media_type="application/json",
+                            headers=_OHLCV_HEADERS)
+
+        err1 = None
+        try:
+            rows = await _fetch_ohlcv_hyperliquid(coin, hl_interval, start_ms, end_ms)
+            body = orjson.dumps(rows)
+            _ohlcv_cache_put(cache_key, bucket, body)
+            return Response(content=body, media_type="application/json",
+                            headers=_OHLCV_HEADERS)
+        except Exception as e:
+            err1 = e
 
-    err1 = None
-    try:
-        return _fetch_ohlcv_hyperliquid(coin, hl_interval, start_ms, end_ms, _num)
-    except Exception as e:
-        err1 = e
+        try:
+            binance_interval = _BINANCE_INTERVAL.get(timeframe, "4h")
+            # When using fixed range, request enough to cover start_ms→end_ms
+            limit_binance = limit if start_time is None else max(limit, (end_ms - start_ms) // interval_ms + 100)
+            limit_binance = min(limit_binance, _OHLCV_LIMIT_MAX)
+            rows = await _fetch_ohlcv_binance(coin, binance_interval, limit_binance,
+                                              start_ms if start_time is not None else 0)
+            body = orjson.dumps(rows)
+            _ohlcv_cache_put(cache_key, bucket, body)
+            return Response(content=body, media_type="application/json",
+                            headers=_OHLCV_HEADERS)
+        except Exception as e:
+            msg = str(e).replace("\n", " ")
+            if err1:
+                raise HTTPException(500, f"OHLCV: Hyperliquid failed ({err1!s}); Binance failed ({msg})")
+            raise HTTPException(500, f"OHLCV error: {msg}")
+
+
+@app.on_event("startup")
+async def _warm_ohlcv_cache():
+    """Prime the candle cache for the default chart query so the first page
+    load after boot doesn't pay the cold upstream round-trip."""
+    async def _warm():
+        try:
+            await get_ohlcv(symbol="BTC/USDT", timeframe="4h", limit=500)
+        except Exception:
+            pass  # best effort — the first real request will fetch instead
 
-    try:
-        binance_interval = {"1h": "1h", "4h": "4h", "1d": "1d"}.get(timeframe, "4h")
-        # When using fixed range, request enough to cover start_ms→end_ms
-        limit_binance = limit if start_time is None else max(limit, (end_ms - start_ms) // interval_ms + 100)
-        limit_binance = min(limit_binance, 50000)
-        return _fetch_ohlcv_binance(coin, binance_interval, limit_binance, start_ms if start_time is not None else 0)
-    except Exception as e:
-        msg = str(e).replace("\n", " ")
-        if err1:
-            raise HTTPException(500, f"OHLCV: Hyperliquid failed ({err1!s}); Binance failed ({msg})")
-        raise HTTPException(500, f"OHLCV error: {msg}")
+    asyncio.create_task(_warm())
 
 
 @app.get("/api/ticker")
-def get_ticker():
+async def get_ticker():
     """
     Returns current mid prices for all coins from Hyperliquid (allMids).
     Used by the Predictions page to show current market price vs signal levels.
     """
-    import urllib.request as urlreq
-    payload = json.dumps({"type": "allMids"}).encode()
-    try:
-        req = urlreq.Request(
-            "https://api.hyperliquid.xyz/info",
-            data=payload,
+    payload = orjson.dumps({"type": "allMids"})
+
+    async def _fetch():
+        resp = await _HTTP.post(
+            _HL_INFO_URL,
+            content=payload,
             headers={"Content-Type": "application/json"},
-            method="POST",
+            timeout=10,
         )
-        with _urlopen_no_ssl_verify(req, 10) as resp:
-            raw = json.loads(resp.read().decode())
+        raw = orjson.loads(resp.content)
         return {k: float(v) for k, v in raw.items()}
+
+    try:
+        return await _ticker_cache.get_or_fetch("allMids", _TICKER_TTL, _fetch)
     except Exception as e:
         raise HTTPException(500, f"Hyperliquid ticker error: {e}")
 
 
 @app.get("/api/market-stats")
-def get_market_stats(symbol: str = "BTC"):
+async def get_market_stats(symbol: str = "BTC"):
     """
     Returns market stats for the chart header: price, 24h volume, open interest, funding, impact.
     Uses Hyperliquid metaAndAssetCtxs; symbol should be the perp name (e.g. BTC, ETH).
     """
-    import urllib.request as urlreq
     coin = symbol.upper().replace("/USDT", "").replace("/", "").strip() or "BTC"
-    payload = json.dumps({"type": "metaAndAssetCtxs"}).encode()
+    payload = orjson.dumps({"type": "metaAndAssetCtxs"})
     try:
-        req = urlreq.Request(
-            "https://api.hyperliquid.xyz/info",
-            data=payload,
+        resp = await _HTTP.post(
+            _HL_INFO_URL,
+            content=payload,
             headers={"Content-Type": "application/json", "User-Agent": "AstroBot-Dashboard/1.0"},
-            method="POST",
+            timeout=10,
         )
-        with _urlopen_no_ssl_verify(req, 10) as resp:
-            raw = json.loads(resp.read().decode())
+        raw = orjson.loads(resp.content)
     except Exception as e:
         raise HTTPException(500, f"Market stats error: {e}")
     if not isinstance(raw, list) or len(raw) < 2:
@@ -586,7 +1278,7 @@ def _fetch_bot_api(path: str, params: Optional[dict] = None, timeout: int = 15)
     req = urlreq.Request(url, method="GET", headers={"Accept": "application/json"})
     try:
         with _urlopen_no_ssl_verify(req, timeout=timeout) as resp:
-            return json.loads(resp.read().decode())
+            return orjson.loads(resp.read())
     except Exception as e:
         raise HTTPException(502, f"Bot API error: {e}")
 
@@ -619,52 +1311,72 @@ def _predictions_calendar_file() -> Optional[Path]:
     return p if p.exists() else None
 
 
+# Filtered calendar responses keyed by (file mtime, year): the source file is
+# static, so the ~365-day filter pass runs once per year window, not per hit.
+# Bounded because year comes from a client-controlled query param; the clamp
+# below keeps the keyspace tiny, the size cap is the backstop.
+_CALENDAR_CACHE_MAX = 16
+_CALENDAR_YEAR_MIN, _CALENDAR_YEAR_MAX = 2020, 2100
+_calendar_cache: dict[tuple[int, int], dict] = {}
+
+
+def _calendar_unavailable(reason: str, hint: Optional[str] = None) -> dict:
+    out = {
+        "unavailable": True,
+        "reason": reason,
+        "asset": None,
+        "life_path_number": None,
+        "from": None,
+        "to": None,
+        "days": [],
+    }
+    if hint:
+        out["hint"] = hint
+    return out
+
+
 @app.get("/api/predictions/calendar")
-def get_predictions_calendar(until_year: int = 0, asset: Optional[str] = None):
+def get_predictions_calendar(request: Request, until_year: int = 0,
+                             asset: Optional[str] = None):
     """
     Returns day-by-day predictions from backend/data/predictions_calendar.json.
     Query params: until_year (filter days to this year), asset (ignored; file is single-asset).
     """
+    return _etag_json(request, _calendar_payload(until_year))
+
+
+def _calendar_payload(until_year: int) -> dict:
     year = until_year or datetime.now(timezone.utc).date().year
+    # Out-of-range years can't match any calendar entry anyway; clamping
+    # keeps client input from minting unlimited cache keys.
+    year = max(_CALENDAR_YEAR_MIN, min(year, _CALENDAR_YEAR_MAX))
     calendar_file = _predictions_calendar_file()
     if not calendar_file:
-        return {
-            "unavailable": True,
-            "reason": "predictions_calendar.json not found",
-            "hint": "Add backend/data/predictions_calendar.json (e.g. from bot: python scripts/predict_calendar.py --to YYYY-12-31).",
-            "asset": None,
-            "life_path_number": None,
-            "from": None,
-            "to": None,
-            "days": [],
-        }
+        return _calendar_unavailable(
+            "predictions_calendar.json not found",
+            hint="Add backend/data/predictions_calendar.json (e.g. from bot: "
+                 "python scripts/predict_calendar.py --to YYYY-12-31).",
+        )
     try:
-        with open(calendar_file) as f:
-            data = json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {
-            "unavailable": True,
-            "reason": "Failed to load predictions_calendar.json",
-            "asset": None,
-            "life_path_number": None,
-            "from": None,
-            "to": None,
-            "days": [],
-        }
+        mtime = calendar_file.stat().st_mtime_ns
+    except OSError:
+        mtime = 0
+    cached = _calendar_cache.get((mtime, year))
+    if cached is not None:
+        return cached
+    try:
+        data = orjson.loads(calendar_file.read_bytes())
+    except (orjson.JSONDecodeError, IOError):
+        return _calendar_unavailable("Failed to load predictions_calendar.json")
     if not isinstance(data.get("days"), list):
-        return {
-            "unavailable": True,
-            "reason": "Invalid predictions_calendar.json format",
-            "asset": None,
-            "life_path_number": None,
-            "from": None,
-            "to": None,
-            "days": [],
-        }
+        return _calendar_unavailable("Invalid predictions_calendar.json format")
     year_str = str(year)
     data["days"] = [d for d in data["days"] if d.get("date", "").startswith(year_str)]
     data["from"] = data["days"][0]["date"] if data["days"] else None
     data["to"] = data["days"][-1]["date"] if data["days"] else None
+    if len(_calendar_cache) >= _CALENDAR_CACHE_MAX:
+        _calendar_cache.clear()  # also evicts entries for stale mtimes
+    _calendar_cache[(mtime, year)] = data
     return data
 
 
@@ -712,15 +1424,23 @@ def close_paper_trade(user_id: str, index: int):
 
 
 # ── User provisioning via Railway API ─────────────────────────────────────────
+# 2-32 lowercase alphanumeric / hyphen chars — enforced in pydantic's Rust
+# core rather than a Python field_validator.
+Username = Annotated[str, StringConstraints(pattern=r"^[a-z0-9\-]{2,32}$")]
+
+
 class RegisterUserIn(BaseModel):
-    username:     str    # unique ID for this user  (alphanumeric + dash)
-    display_name: str    # Human-readable label shown in the dashboard
-    wallet:       str    # Hyperliquid wallet address  0x...
-    private_key:  str    # Hyperliquid agent wallet private key  0x...
+    username:     Username  # unique ID for this user  (alphanumeric + dash)
+    display_name: str       # Human-readable label shown in the dashboard
+    wallet:       str       # Hyperliquid wallet address  0x...
+    private_key:  str       # Hyperliquid agent wallet private key  0x...
+
+
+_RAILWAY_GQL_URL = "https://backboard.railway.app/graphql/v2"
 
 
 @app.post("/api/users/register")
-def register_user(body: RegisterUserIn):
+async def register_user(body: RegisterUserIn):
     """
     Provision a new bot user on Railway.
 
@@ -731,14 +1451,9 @@ def register_user(body: RegisterUserIn):
     Requires RAILWAY_API_KEY, RAILWAY_PROJECT_ID, RAILWAY_ENVIRONMENT_ID, and
     BOT_TEMPLATE_SERVICE_ID to be set in this service's env vars.
     """
-    if not re.fullmatch(r"[a-z0-9\-]{2,32}", body.username):
-        raise HTTPException(400, "username must be 2-32 lowercase alphanumeric / hyphen chars")
-
     if not RAILWAY_API_KEY:
         raise HTTPException(503, "RAILWAY_API_KEY not configured — cannot auto-provision")
 
-    import urllib.request
-
     headers = {
         "Content-Type":  "application/json",
         "Authorization": f"Bearer {RAILWAY_API_KEY}",
@@ -750,7 +1465,7 @@ def register_user(body: RegisterUserIn):
       serviceCreate(input: $input) { id name }
     }
     """
-    payload = json.dumps({
+    payload = orjson.dumps({
         "query": mutation,
         "variables": {
             "input": {
@@ -759,13 +1474,11 @@ def register_user(body: RegisterUserIn):
                 "sourceServiceId": BOT_TEMPLATE_SERVICE_ID or None,
             }
         }
-    }).encode()
+    })
 
-    req  = urllib.request.Request("https://backboard.railway.app/graphql/v2",
-                                   data=payload, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read())
+        resp = await _RAILWAY_HTTP.post(_RAILWAY_GQL_URL, content=payload, headers=headers)
+        data = orjson.loads(resp.content)
     except Exception as e:
         raise HTTPException(500, f"Railway API error creating service: {e}")
 
@@ -781,7 +1494,7 @@ def register_user(body: RegisterUserIn):
       variableCollectionUpsert(input: $input)
     }
     """
-    env_payload = json.dumps({
+    env_payload = orjson.dumps({
         "query": env_mutation,
         "variables": {
             "input": {
@@ -796,13 +1509,11 @@ def register_user(body: RegisterUserIn):
                 }
             }
         }
-    }).encode()
+    })
 
-    req2 = urllib.request.Request("https://backboard.railway.app/graphql/v2",
-                                   data=env_payload, headers=headers, method="POST")
     try:
-        with urllib.request.urlopen(req2, timeout=15) as resp:
-            data2 = json.loads(resp.read())
+        resp2 = await _RAILWAY_HTTP.post(_RAILWAY_GQL_URL, content=env_payload, headers=headers)
+        data2 = orjson.loads(resp2.content)
     except Exception as e:
         raise HTTPException(500, f"Railway API error setting env vars: {e}")
 
@@ -820,7 +1531,9 @@ def register_user(body: RegisterUserIn):
             "railway_service_id": new_service_id,
         })
         if USERS_FILE.exists():
-            USERS_FILE.write_text(json.dumps(users, indent=2))
+            _save_users(users)
+        else:
+            _invalidate_users_cache()
 
     return {
         "status":     "ok",
@@ -843,26 +1556,15 @@ def remove_user(user_id: str):
         raise HTTPException(404, f"User '{user_id}' not found")
     updated = [u for u in users if u["id"] != user_id]
     if USERS_FILE.exists():
-        USERS_FILE.write_text(json.dumps(updated, indent=2))
+        _save_users(updated)
+    else:
+        _invalidate_users_cache()
     return {"status": "ok", "removed": target,
             "note": "Railway service must be deleted manually in the Railway dashboard."}
 
 
-@app.get("/api/users/{user_id}/service-status")
-def service_status(user_id: str):
-    """
-    Returns Railway deployment status for a bot instance.
-    Requires RAILWAY_API_KEY + railway_service_id stored in users.json.
-    """
-    user = users_map().get(user_id)
-    if not user:
-        raise HTTPException(404, f"User '{user_id}' not found")
-
-    service_id = user.get("railway_service_id")
-    if not service_id or not RAILWAY_API_KEY:
-        return {"status": "unknown", "reason": "RAILWAY_API_KEY or service_id not configured"}
-
-    import urllib.request
+async def _railway_deployment_status(service_id: str) -> dict:
+    """Fetch the latest Railway deployment status for one service."""
     query = """
     query ServiceDeployments($serviceId: String!, $environmentId: String!) {
       deployments(
@@ -873,20 +1575,18 @@ def service_status(user_id: str):
       }
     }
     """
-    payload = json.dumps({
+    payload = orjson.dumps({
         "query": query,
         "variables": {"serviceId": service_id, "environmentId": RAILWAY_ENV_ID}
-    }).encode()
-    req = urllib.request.Request(
-        "https://backboard.railway.app/graphql/v2",
-        data=payload,
-        headers={"Content-Type": "application/json",
-                 "Authorization": f"Bearer {RAILWAY_API_KEY}"},
-        method="POST",
-    )
+    })
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
+        resp = await _RAILWAY_HTTP.post(
+            _RAILWAY_GQL_URL,
+            content=payload,
+            headers={"Content-Type": "application/json",
+                     "Authorization": f"Bearer {RAILWAY_API_KEY}"},
+        )
+        data = orjson.loads(resp.content)
         edges = data["data"]["deployments"]["edges"]
         latest = edges[0]["node"] if edges else {}
         return {
@@ -898,46 +1598,213 @@ def service_status(user_id: str):
         return {"status": "error", "reason": str(e)}
 
 
+_SERVICES_TTL = 5.0
+_STATUS_UNCONFIGURED = {"status": "unknown",
+                        "reason": "RAILWAY_API_KEY or service_id not configured"}
+
+
+@app.get("/api/services")
+async def list_service_statuses():
+    """
+    Returns {user_id: deployment status} for all users in one shot.
+    Statuses are fetched concurrently and cached for 5s so N users (or many
+    dashboard refreshes) cost at most one Railway sweep per interval.
+    """
+    hit = _cache_get(("services",))
+    if hit:
+        return hit[1]
+
+    async def _one(user: dict) -> tuple[str, dict]:
+        service_id = user.get("railway_service_id")
+        if not service_id or not RAILWAY_API_KEY:
+            return user["id"], _STATUS_UNCONFIGURED
+        return user["id"], await _railway_deployment_status(service_id)
+
+    results = await asyncio.gather(*map(_one, load_users()))
+    statuses = dict(results)
+    _cache_put(("services",), statuses, ttl=_SERVICES_TTL)
+    return statuses
+
+
+@app.get("/api/users/{user_id}/service-status")
+async def service_status(user_id: str):
+    """
+    Returns Railway deployment status for a bot instance.
+    Requires RAILWAY_API_KEY + railway_service_id stored in users.json.
+    """
+    if user_id not in users_map():
+        raise HTTPException(404, f"User '{user_id}' not found")
+    statuses = await list_service_statuses()
+    return statuses.get(user_id, _STATUS_UNCONFIGURED)
+
+
 # ── WebSocket broadcast ────────────────────────────────────────────────────────
 class ConnectionManager:
     def __init__(self):
-        self.active: list[WebSocket] = []
+        self.active: set[WebSocket] = set()
 
     async def connect(self, ws: WebSocket):
         await ws.accept()
-        self.active.append(ws)
+        self.active.add(ws)
 
     def disconnect(self, ws: WebSocket):
-        if ws in self.active:
-            self.active.remove(ws)
+        self.active.discard(ws)
+
+    async def broadcast_bytes(self, payload: bytes):
+        # Concurrent fan-out: one slow client costs max(latencies), not sum.
+        # The tuple snapshot keeps iteration safe while connects/disconnects
+        # mutate the set mid-broadcast; failed sockets are swept afterwards.
+        conns = tuple(self.active)
+        results = await asyncio.gather(
+            *(ws.send_bytes(payload) for ws in conns), return_exceptions=True)
+        for ws, res in zip(conns, results):
+            if isinstance(res, BaseException):
+                self.disconnect(ws)
 
     async def broadcast(self, data: dict):
-        for ws in self.active[:]:
-            try:
-                await ws.send_json(data)
-            except Exception:
-                self.disconnect(ws)
+        # Encode once; send_json would re-serialize the same dict per socket.
+        await self.broadcast_bytes(orjson.dumps(data))
 
 
 manager = ConnectionManager()
 
 
+_WS_USERS_REFRESH = 300  # re-read users.json every 5 min, not every tick
+_WS_TICK          = 30   # base broadcast interval
+_WS_TICK_IDLE_MAX = 120  # back off to this when nothing is changing
+
+# Set by the Postgres LISTEN thread when the bot NOTIFYs a new signal; the
+# broadcast loop wakes immediately instead of waiting out its interval.
+_ws_wakeup = asyncio.Event()
+
+# Most recent encoded broadcast frame, replayed to clients as they connect so
+# a fresh dashboard paints immediately instead of waiting for the next tick.
+# Kept as bytes: one orjson.dumps per tick serves every broadcast and every
+# late joiner.
+_latest_frame: Optional[bytes] = None
+
+
+def _watched_mtime(users: list[dict]) -> float:
+    """Newest mtime across the bot files the broadcast payload is built from."""
+    newest = USERS_FILE.stat().st_mtime if USERS_FILE.exists() else 0.0
+    for u in users:
+        logs = Path(u["bot_dir"]) / "logs"
+        # signals.db-wal matters: in WAL mode commits land there and the main
+        # db file's mtime only moves on checkpoint, potentially hours later.
+        for name in ("signals.db", "signals.db-wal",
+                     "open_positions.json", "equity_state.json"):
+            try:
+                newest = max(newest, (logs / name).stat().st_mtime)
+            except OSError:
+                pass
+    return newest
+
+
+async def _collect_user(user: dict) -> tuple[str, dict]:
+    """Gather one user's positions/equity/latest-signal with the reads in parallel."""
+    uid = user["id"]
+    bd  = Path(user["bot_dir"])
+    positions, equity, latest = await asyncio.gather(
+        asyncio.to_thread(_load_positions, bd, uid),
+        asyncio.to_thread(_load_equity, bd, uid),
+        query_signals_db(bd, 1, user_id=uid),
+    )
+    return uid, {
+        "positions":     positions,
+        "equity":        equity,
+        "latest_signal": (latest or [{}])[0],
+    }
+
+
+async def _broadcast_loop():
+    """
+    Single shared ticker: one data sweep per interval, pushed to every client.
+    With no clients, or no change in any watched bot file, the interval
+    doubles up to _WS_TICK_IDLE_MAX so an unopened dashboard costs ~nothing.
+    """
+    global _latest_frame
+    users = load_users()
+    users_read = time.monotonic()
+    interval = _WS_TICK
+    last_mtime = -1.0
+    while True:
+        try:
+            if manager.active:
+                if time.monotonic() - users_read > _WS_USERS_REFRESH:
+                    users = load_users()
+                    users_read = time.monotonic()
+                # In PG mode there are no local files to watch — always sweep.
+                mtime = -1.0 if _USE_PG else _watched_mtime(users)
+                if _USE_PG or mtime != last_mtime:
+                    if _USE_PG:
+                        payload = await asyncio.to_thread(_collect_all_pg, users)
+                    else:
+                        results = await asyncio.gather(*map(_collect_user, users))
+                        payload = dict(results)
+                    frame = orjson.dumps({"type": "update", "data": payload})
+                    _latest_frame = frame
+                    await manager.broadcast_bytes(frame)
+                    last_mtime = mtime
+                    interval = _WS_TICK
+                else:
+                    interval = min(interval * 2, _WS_TICK_IDLE_MAX)
+            else:
+                interval = min(interval * 2, _WS_TICK_IDLE_MAX)
+        except Exception:
+            # A transient failure (DB hiccup, pool exhaustion) must not kill
+            # the shared loop — every connected client would silently go
+            # stale. Log it and sweep again next tick.
+            _log.exception("broadcast sweep failed; retrying next tick")
+            interval = _WS_TICK
+        try:
+            await asyncio.wait_for(_ws_wakeup.wait(), timeout=interval)
+            _ws_wakeup.clear()
+            interval = _WS_TICK  # data just changed — drop any idle backoff
+        except asyncio.TimeoutError:
+            pass  # no notification — the interval acts as the safety timer
+
+
+@app.on_event("startup")
+async def _start_broadcast_loop():
+    asyncio.create_task(_broadcast_loop())
+    if _USE_PG:
+        loop = asyncio.get_running_loop()
+        threading.Thread(
+            target=_pg_listen_forever,
+            args=(lambda: loop.call_soon_threadsafe(_ws_wakeup.set),),
+            daemon=True,
+        ).start()
+
+
+def _collect_all_pg(users: list[dict]) -> dict:
+    """PG mode: the whole per-user fan-out in two SQL round-trips
+    (latest signal per user + all positions/equity kv rows)."""
+    uids = [u["id"] for u in users]
+    latest = _pg_latest_signal_all(uids)
+    kv = _pg_kv_multiget([f"{uid}:{t}" for uid in uids
+                          for t in ("open_positions", "equity_state")])
+    return {
+        uid: {
+            "positions":     kv.get(f"{uid}:open_positions", []),
+            "equity":        kv.get(f"{uid}:equity_state", {}),
+            "latest_signal": latest.get(uid, {}),
+        }
+        for uid in uids
+    }
+
+
 @app.websocket("/ws")
 async def ws_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    # Kick the broadcast loop so the first subscriber after boot (no frame
+    # yet) or an idle backoff gets fresh data within one sweep instead of
+    # waiting out up to _WS_TICK_IDLE_MAX.
+    _ws_wakeup.set()
     try:
+        if _latest_frame is not None:
+            await websocket.send_bytes(_latest_frame)
         while True:
-            users = load_users()
-            payload: dict = {}
-            for user in users:
-                uid = user["id"]
-                bd  = Path(user["bot_dir"])
-                payload[uid] = {
-                    "positions":     _load_positions(bd, user_id=uid),
-                    "equity":        _load_equity(bd, user_id=uid),
-                    "latest_signal": (query_signals_db(bd, 1, user_id=uid) or [{}])[0],
-                }
-            await websocket.send_json({"type": "update", "data": payload})
-            await asyncio.sleep(30)
+            # Updates are pushed by _broadcast_loop; this just keeps the socket open.
+            await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -4,4 +4,5 @@
 echo "=== Astro-Bot API startup ==="
 echo "PORT=${PORT:-8000}"
 echo "DATABASE_URL set: ${DATABASE_URL:+yes}${DATABASE_URL:-NO — postgres features disabled}"
-exec uvicorn main:app --host 0.0.0.0 --port "${PORT:-8000}" --log-level info
+exec uvicorn main:app --host 0.0.0.0 --port "${PORT:-8000}" --log-level info \
+    --loop uvloop --http httptools